@@ -2,6 +2,9 @@ import requests
 
 
 class BaseApi():
+    # swap this out to point every api call at a local sleeper stand-in
+    HOST = "https://api.sleeper.app"
+
     def _call(self, url, params=None):
         """Calls the api url requested and returns the json result"""
         result_json_string = requests.get(url, params)
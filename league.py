@@ -26,8 +26,8 @@ class League(BaseApi):
 
         self.week = weeks_elapsed
         self.league_id = league_id
-        self._base_url = "https://api.sleeper.app/v1/league/{}".format(
-            self.league_id)
+        self._base_url = "{}/v1/league/{}".format(
+            self.HOST, self.league_id)
 
         # get raw api calls for needed league info
         self._league = self._call(self._base_url)
@@ -225,8 +225,7 @@ class League(BaseApi):
                 else:
                     team.simmed_wins += 1
 
-                matchup = team.matchups[remaining_week + self.week]
-                opponent = matchup[0]["roster_id"] if matchup[0]["roster_id"] != team.roster_id else matchup[1]["roster_id"]
+                opponent = team.opponent(self.week + 1 + remaining_week)
                 
                 simmed_week = (team.simmed_weeks[remaining_week], self.teams[opponent].simmed_weeks[remaining_week])
                 team.scoreboards[remaining_week + self.week] = simmed_week
@@ -238,6 +237,42 @@ class League(BaseApi):
                 else:
                     team.simmed_wins += 1
             
+    def remaining_opponents(self) -> np.ndarray:
+        """returns a (teams x remaining weeks) array of each teams' opponents as indices into the standings"""
+        weeks = self.regular_season_weeks - self.week
+        ids = [team.roster_id for team in self.standings]
+        return np.array([[ids.index(team.opponent(self.week + 1 + week)) for week in range(weeks)]
+                         for team in self.standings], dtype=int).reshape(len(ids), weeks)
+
+    def sim_remaining_scores(self, model, runs: int) -> tuple[np.ndarray, np.ndarray]:
+        """sims every teams' scores and their opponents' scores for the remaining weeks
+        as (teams x runs x weeks) arrays in standings order, leaving the teams untouched
+        """
+        weeks = self.regular_season_weeks - self.week
+        model.fit({team.roster_id: team.points_scored() for team in self.standings})
+        scores = np.stack([team.predict_scores(model, runs, weeks) for team in self.standings])
+
+        # look up every teams' opponent score in each remaining week
+        opponents = self.remaining_opponents()
+        against = scores[opponents, :, np.arange(weeks)].transpose(0, 2, 1)
+        return scores, against
+
+    def sim_remaining_seasons(self, model, runs: int) -> dict:
+        """sim the remainder of the season many times at once from a score model
+
+        returns each teams' simmed wins, losses, pf and pa as arrays with one entry per run
+        """
+        weeks = self.regular_season_weeks - self.week
+        ids = [team.roster_id for team in self.standings]
+        scores, against = self.sim_remaining_scores(model, runs)
+        medians = np.median(scores, axis=0)
+
+        wins = (scores >= medians).sum(axis=2) + (scores >= against).sum(axis=2)
+        pf = scores.sum(axis=2)
+        pa = against.sum(axis=2)
+
+        return {roster_id: (wins[i], 2 * weeks - wins[i], pf[i], pa[i]) for i, roster_id in enumerate(ids)}
+
     def simmed_results(self) -> list[list[Team]]:
         """returns the standings in the two divisions when taking simmed results into account"""
         simmed_standings = []
@@ -31,7 +31,7 @@ class Players(BaseApi):
                 print(
                     f"Done with player {num} out of {len(self.players_meta.keys())}")
 
-            player = self._call(url="https://api.sleeper.app/stats/nfl/player/{}".format(player_id),
+            player = self._call(url="{}/stats/nfl/player/{}".format(self.HOST, player_id),
                                 params={"season_type": "regular", "season": self.YEAR, "grouping": "season"})
 
             # None type responses are players without stats
@@ -42,7 +42,7 @@ class Players(BaseApi):
 
     def _get_all_players(self, offense_only: bool) -> None:
         """gets all player metadata (fast)"""
-        player_meta = self._call("https://api.sleeper.app/v1/players/nfl")
+        player_meta = self._call("{}/v1/players/nfl".format(self.HOST))
 
         # make future updates slightly quicker by eliminating defensive players from this dictionary
         if offense_only:
@@ -0,0 +1,198 @@
+import statistics as stats
+import time
+import numpy as np
+
+
+class ScoreModel():
+    """base class for team score models that are fit once per team and
+    then sample whole blocks of scores in one call
+
+    subclasses implement _fit and _sample, the base class records how long
+    fitting and sampling take so models can be compared on cost as well as accuracy
+    """
+    name = "base"
+    # fewest weeks a team needs to fit on, a standard deviation needs two
+    MIN_WEEKS = 2
+
+    def __init__(self, seed: int = None) -> None:
+        self.rng = np.random.default_rng(seed)
+        self.params = {}
+        self.fit_time = 0.0
+        self.sample_time = 0.0
+
+    def fit(self, scores: dict) -> None:
+        """fits the model to each teams' points scored, keyed by roster id"""
+        short = [roster_id for roster_id, points in scores.items() if len(points) < self.MIN_WEEKS]
+        if short:
+            raise ValueError("{} needs at least {} weeks to fit on, rosters {} have fewer".format(
+                self.name, self.MIN_WEEKS, short))
+
+        start = time.perf_counter()
+        self.params = {}
+        self._fit({roster_id: np.asarray(points, dtype=float)
+                   for roster_id, points in scores.items()})
+        self.fit_time += time.perf_counter() - start
+
+    def sample(self, roster_id: int, size: tuple) -> np.ndarray:
+        """samples a block of scores of the given shape for a team"""
+        start = time.perf_counter()
+        scores = self._sample(roster_id, size)
+        self.sample_time += time.perf_counter() - start
+        return scores
+
+    def _fit(self, scores: dict) -> None:
+        raise NotImplementedError
+
+    def _sample(self, roster_id: int, size: tuple) -> np.ndarray:
+        raise NotImplementedError
+
+
+class NormalModel(ScoreModel):
+    """normal distribution fit to each teams' mean and standard deviation"""
+    name = "normal"
+
+    def _fit(self, scores: dict) -> None:
+        for roster_id, points in scores.items():
+            self.params[roster_id] = (points.mean(), points.std(ddof=1))
+
+    def _sample(self, roster_id: int, size: tuple) -> np.ndarray:
+        loc, scale = self.params[roster_id]
+        return self.rng.normal(loc, scale, size)
+
+
+class UpdatingNormalModel(ScoreModel):
+    """normal distribution refit after every simulated week on the teams' real
+    and simulated scores so far, the same as League.sim_remaining_season
+    """
+    name = "updating-normal"
+
+    def _fit(self, scores: dict) -> None:
+        for roster_id, points in scores.items():
+            self.params[roster_id] = (len(points), points.sum(), (points ** 2).sum())
+
+    def _sample(self, roster_id: int, size: tuple) -> np.ndarray:
+        count, total, squares = self.params[roster_id]
+        runs, weeks = size
+        total = np.full(runs, total)
+        squares = np.full(runs, squares)
+
+        # each run keeps its own running sums, so every run refits on its own simulated weeks
+        scores = np.empty(size)
+        for week in range(weeks):
+            n = count + week
+            mean = total / n
+            scale = np.sqrt(np.maximum(squares - total * mean, 0) / (n - 1))
+            scores[:, week] = self.rng.normal(mean, scale)
+            total += scores[:, week]
+            squares += scores[:, week] ** 2
+
+        return scores
+
+
+class BootstrapModel(ScoreModel):
+    """empirical bootstrap that resamples a teams' own weekly scores"""
+    name = "bootstrap"
+    MIN_WEEKS = 1
+
+    def _fit(self, scores: dict) -> None:
+        self.params = scores
+
+    def _sample(self, roster_id: int, size: tuple) -> np.ndarray:
+        return self.rng.choice(self.params[roster_id], size)
+
+
+class StudentTModel(ScoreModel):
+    """student-t distribution with the same mean and variance as a teams' scores
+    but heavier tails for boom and bust weeks
+    """
+    name = "student-t"
+
+    def __init__(self, seed: int = None, *, df: float = 5) -> None:
+        super().__init__(seed)
+        if df <= 2:
+            raise ValueError("df must be greater than 2 to have a finite variance")
+        self.df = df
+
+    def _fit(self, scores: dict) -> None:
+        for roster_id, points in scores.items():
+            # a t with df degrees of freedom has variance df / (df - 2), so scale it back down
+            self.params[roster_id] = (points.mean(), points.std(
+                ddof=1) * np.sqrt((self.df - 2) / self.df))
+
+    def _sample(self, roster_id: int, size: tuple) -> np.ndarray:
+        loc, scale = self.params[roster_id]
+        return loc + scale * self.rng.standard_t(self.df, size)
+
+
+class ShrinkageModel(ScoreModel):
+    """normal distribution whose team means are shrunk toward the league mean
+
+    with only a handful of weeks a teams' average is noisy, so each mean is
+    pulled toward the league average by how much of the spread between teams
+    is explained by week to week noise
+    """
+    name = "shrinkage"
+
+    def _fit(self, scores: dict) -> None:
+        means = np.array([points.mean() for points in scores.values()])
+        counts = np.array([len(points) for points in scores.values()])
+        within = stats.mean([points.var(ddof=1) for points in scores.values()])
+
+        # between team variance left over after removing the noise in each mean
+        noise = within / counts
+        between = max(means.var(ddof=1) - noise.mean(), 0.0)
+        shrink = noise / (noise + between) if between > 0 else np.ones(len(means))
+        shrunk = shrink * means.mean() + (1 - shrink) * means
+
+        for i, roster_id in enumerate(scores):
+            # predictive spread includes the uncertainty left in the shrunk mean
+            self.params[roster_id] = (shrunk[i], np.sqrt(
+                within + (1 - shrink[i]) * noise[i]))
+
+    def _sample(self, roster_id: int, size: tuple) -> np.ndarray:
+        loc, scale = self.params[roster_id]
+        return self.rng.normal(loc, scale, size)
+
+
+MODELS = {model.name: model for model in [
+    NormalModel, UpdatingNormalModel, BootstrapModel, StudentTModel, ShrinkageModel]}
+
+
+def crps(samples: np.ndarray, actual: float) -> float:
+    """sample estimate of the continuous ranked probability score, lower is better"""
+    return np.abs(samples - actual).mean() - 0.5 * np.abs(samples - np.roll(samples, 1)).mean()
+
+
+def evaluate(model: ScoreModel, league, thru: int, draws: int = 2000) -> dict:
+    """fits a model on weeks played through thru and scores it against the
+    weeks that were actually played after that
+    """
+    teams = league.standings
+    model.fit_time, model.sample_time = 0.0, 0.0
+    model.fit({team.roster_id: team.points_scored()[:thru] for team in teams})
+
+    errors = []
+    for team in teams:
+        actual = team.points_scored()[thru:]
+        if not actual:
+            continue
+        samples = model.sample(team.roster_id, (draws, len(actual)))
+        errors += [crps(samples[:, week], score)
+                   for week, score in enumerate(actual)]
+
+    return {"model": model.name, "thru": thru, "weeks": league.week - thru,
+            "crps": float(np.mean(errors)) if errors else None,
+            "fit_time": model.fit_time, "sample_time": model.sample_time}
+
+
+def main() -> None:
+    from league import League
+    from players import Players
+
+    league = League(11, "649912836461539328", Players())
+    for model in [model() for model in MODELS.values()]:
+        print(evaluate(model, league, thru=6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import numpy as np
+from base_api import BaseApi
+from league import League
+from players import Players
+from positions import Position
+from score_models import MODELS, UpdatingNormalModel
+
+
+class NotFound(LookupError):
+    """raised when a query asks for a league, roster or position that doesn't exist"""
+
+
+class Snapshot():
+    """a fully built league plus the simulation batches run against it"""
+
+    def __init__(self, players: Players, league: League) -> None:
+        self.players = players
+        self.league = league
+        self.built_at = time.time()
+
+        # guards the simulation batch cache
+        self.lock = threading.Lock()
+        self.batches = OrderedDict()
+
+
+class LeagueService(BaseApi):
+    """keeps the player universe, built leagues and recent simulations warm
+    so repeated queries skip rebuilding everything from the api
+    """
+    PLAYOFF_SPOTS = 3
+    DEFAULT_RUNS = 1000
+    MAX_BATCHES = 4
+    MAX_RUNS = 100000
+
+    def __init__(self, leagues: dict, fp='player_stats.json', model=UpdatingNormalModel) -> None:
+        super().__init__()
+
+        # leagues map a league id to a fixed number of weeks elapsed, or None to
+        # work it out from sleeper on every build
+        self.leagues = leagues
+        self.fp = fp
+        # a score model class from score_models, the default refits after every simulated
+        # week like League.sim_remaining_season. a fresh model is built for every batch
+        # so concurrent sims don't share its state
+        self.model = model
+
+        # readers only ever hold this lock long enough to grab a snapshot reference
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        self._errors = {}
+        self._stop = threading.Event()
+        self._refresher = None
+
+    def weeks_elapsed(self, league_id: str) -> int:
+        """works out how many weeks of a league have been scored from sleeper"""
+        league = self._call("{}/v1/league/{}".format(self.HOST, league_id))
+        if isinstance(league, Exception):
+            raise league
+
+        settings = league["settings"]
+        weeks = settings.get("last_scored_leg")
+        if weeks is None:
+            # fall back to the records, where median leagues play two games a week
+            rosters = self._call("{}/v1/league/{}/rosters".format(self.HOST, league_id))
+            if isinstance(rosters, Exception):
+                raise rosters
+            games = max(roster["settings"]["wins"] + roster["settings"]["losses"] + roster["settings"].get("ties", 0)
+                        for roster in rosters)
+            weeks = games // (2 if settings.get("league_average_match") else 1)
+
+        return min(weeks, settings["playoff_week_start"] - 1)
+
+    def build(self, league_id: str) -> Snapshot:
+        """builds a fresh snapshot of a league and warms its default simulation"""
+        weeks = self.leagues[league_id]
+        if weeks is None:
+            weeks = self.weeks_elapsed(league_id)
+
+        players = Players(fp=self.fp)
+        snapshot = Snapshot(players, League(weeks, league_id, players))
+        self.simulate(snapshot, self.DEFAULT_RUNS)
+        return snapshot
+
+    def install(self, league_id: str) -> Snapshot:
+        """builds a league and swaps the new snapshot in"""
+        # build outside the lock so readers keep getting the old snapshot meanwhile
+        snapshot = self.build(league_id)
+        with self._lock:
+            self._snapshots[league_id] = snapshot
+            self._errors.pop(league_id, None)
+
+        return snapshot
+
+    def refresh(self) -> None:
+        """rebuilds every league, one failing league doesn't hold up the rest"""
+        for league_id in list(self.leagues):
+            try:
+                self.install(league_id)
+            except Exception as e:  # keep serving the old snapshot
+                print("refreshing league {} failed: {}".format(league_id, e))
+                with self._lock:
+                    self._errors[league_id] = "{}: {}".format(type(e).__name__, e)
+
+    def snapshot(self, league_id: str) -> Snapshot:
+        """returns the current snapshot for a league, building it on first use"""
+        with self._lock:
+            snapshot = self._snapshots.get(league_id)
+        if snapshot is None:
+            if league_id not in self.leagues:
+                raise NotFound("unknown league {}".format(league_id))
+            snapshot = self.install(league_id)
+
+        return snapshot
+
+    def start(self, interval: float) -> None:
+        """refreshes every league now and then again every interval seconds in the background"""
+        self.refresh()
+
+        def run():
+            while not self._stop.wait(interval):
+                self.refresh()
+
+        self._refresher = threading.Thread(target=run, daemon=True)
+        self._refresher.start()
+
+    def stop(self) -> None:
+        """stops the background refresh"""
+        self._stop.set()
+        if self._refresher:
+            self._refresher.join()
+
+    def simulate(self, snapshot: Snapshot, runs: int) -> dict:
+        """returns a simulation batch for a snapshot, running it if it isn't cached"""
+        with snapshot.lock:
+            if runs in snapshot.batches:
+                snapshot.batches.move_to_end(runs)
+                return snapshot.batches[runs]
+
+        # the batched sim leaves the teams untouched, so it runs outside the lock
+        # and readers of cached batches never wait on it
+        league = snapshot.league
+        scores, against = league.sim_remaining_scores(self.model(), runs)
+        wins = (scores >= np.median(scores, axis=0)).sum(axis=2) + (scores >= against).sum(axis=2)
+        wins += np.array([team.wins for team in league.standings])[:, None]
+        pf = scores.sum(axis=2) + np.array([team.pf for team in league.standings])[:, None]
+
+        ids = [team.roster_id for team in league.standings]
+        finishes = {}
+        playoffs = np.zeros((len(ids), runs), dtype=bool)
+        for division in league.divisions:
+            index = [ids.index(team.roster_id) for team in division]
+            w, p = wins[index], pf[index]
+
+            # a teams' place is how many division rivals finish ahead of it on wins then pf
+            ahead = (w[None, :] > w[:, None]) | ((w[None, :] == w[:, None]) & (p[None, :] > p[:, None]))
+            places = ahead.sum(axis=1)
+            for place, (i, team) in enumerate(zip(index, division)):
+                finishes[team.roster_id] = np.bincount(
+                    places[place], minlength=len(division)).tolist()
+                playoffs[i] = places[place] < self.PLAYOFF_SPOTS
+
+        # next weeks' head to head result is the first remaining week
+        won_next = scores[:, :, 0] >= against[:, :, 0] if scores.shape[2] else np.zeros_like(playoffs)
+
+        batch = {"runs": runs, "roster_ids": ids, "finishes": finishes,
+                 "playoffs": playoffs, "won_next": won_next}
+        with snapshot.lock:
+            snapshot.batches[runs] = batch
+            if len(snapshot.batches) > self.MAX_BATCHES:
+                snapshot.batches.popitem(last=False)
+
+        return batch
+
+    def standings(self, league_id: str) -> list[dict]:
+        """returns the current league standings"""
+        league = self.snapshot(league_id).league
+        return [{"roster_id": team.roster_id, "name": team.name, "division": team.division,
+                 "wins": team.wins, "losses": team.losses, "pf": team.pf, "pa": team.pa}
+                for team in league.standings]
+
+    def odds(self, league_id: str, runs: int = None, given: int = None) -> dict:
+        """returns each teams' playoff odds, optionally given a team wins next week"""
+        runs = self.DEFAULT_RUNS if runs is None else runs
+        if not 0 < runs <= self.MAX_RUNS:
+            raise ValueError("runs must be between 1 and {}".format(self.MAX_RUNS))
+
+        snapshot = self.snapshot(league_id)
+        batch = self.simulate(snapshot, runs)
+
+        ids = batch["roster_ids"]
+        if given is not None:
+            if given not in snapshot.league.teams:
+                raise NotFound("unknown roster {}".format(given))
+            outcomes = batch["playoffs"][:, batch["won_next"][ids.index(given)]]
+        else:
+            outcomes = batch["playoffs"]
+
+        samples = outcomes.shape[1]
+        return {"runs": batch["runs"], "given": given, "samples": samples,
+                "playoffs": {roster_id: (outcomes[i].mean() * 100 if samples else None)
+                             for i, roster_id in enumerate(ids)},
+                "finishes": batch["finishes"]}
+
+    def waivers(self, league_id: str, position: str, limit: int = 10) -> list[dict]:
+        """returns the unrostered players at a position ranked by points above replacement"""
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        if position not in Position.__members__:
+            raise NotFound("unknown position {}".format(position))
+
+        players = self.snapshot(league_id).players
+        position = Position[position]
+        available = [player for player in players.waiver_players
+                     if (player.is_flex() if position is Position.FLEX else player.pos is position)]
+        available.sort(key=lambda p: p.points, reverse=True)
+        return [{"player_id": player.player_id, "name": player.name, "pos": player.pos.name, "points": player.points,
+                 "par": player.points - players.replacement_averages[position]}
+                for player in available[:limit]]
+
+    def status(self) -> dict:
+        """returns when each warm league was built, which simulation batches it holds
+        and why its last refresh failed if it did
+        """
+        with self._lock:
+            snapshots = dict(self._snapshots)
+            errors = dict(self._errors)
+
+        status = {}
+        for league_id, snapshot in snapshots.items():
+            with snapshot.lock:
+                batches = list(snapshot.batches)
+            status[league_id] = {"week": snapshot.league.week,
+                                 "built_at": snapshot.built_at, "batches": batches}
+        for league_id, error in errors.items():
+            status.setdefault(league_id, {})["error"] = error
+
+        return status
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+        """returns an http server answering queries against this service"""
+        return ThreadingHTTPServer((host, port), _handler(self))
+
+
+def _handler(service: LeagueService):
+    """builds a request handler that routes queries to a league service
+
+    GET /leagues
+    GET /leagues/<id>/standings
+    GET /leagues/<id>/odds?runs=<n>&given=<roster id>
+    GET /leagues/<id>/waivers?position=<pos>&limit=<n>
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            parts = url.path.strip("/").split("/")
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+            try:
+                if parts == ["leagues"]:
+                    result = service.status()
+                elif len(parts) == 3 and parts[0] == "leagues" and parts[2] == "standings":
+                    result = service.standings(parts[1])
+                elif len(parts) == 3 and parts[0] == "leagues" and parts[2] == "odds":
+                    result = service.odds(parts[1],
+                                          int(query["runs"]) if "runs" in query else None,
+                                          int(query["given"]) if "given" in query else None)
+                elif len(parts) == 3 and parts[0] == "leagues" and parts[2] == "waivers":
+                    result = service.waivers(parts[1], query.get("position", "FLEX").upper(),
+                                             int(query.get("limit", 10)))
+                else:
+                    self.send_error(404)
+                    return
+            except NotFound as e:
+                self.send_error(404, str(e))
+                return
+            except ValueError as e:
+                self.send_error(400, str(e))
+                return
+            except Exception as e:
+                self.send_error(500, "{}: {}".format(type(e).__name__, e))
+                return
+
+            body = json.dumps(result).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="serve warm league queries over http")
+    parser.add_argument("--league", action="append", nargs="+", metavar="LEAGUE_ID [WEEK]",
+                        default=None, help="league id and optionally a fixed number of weeks elapsed, repeatable")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--refresh", type=float, default=3600,
+                        help="seconds between background refreshes")
+    parser.add_argument("--model", choices=list(MODELS), default=UpdatingNormalModel.name,
+                        help="score model used to simulate the rest of the season")
+    parser.add_argument("--fixtures", default=None,
+                        help="serve sleeper responses from this directory instead of the api")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        from sleeper_stub import SleeperStub
+        BaseApi.HOST = SleeperStub(args.fixtures).start()
+
+    if args.league and any(len(league) > 2 for league in args.league):
+        parser.error("--league takes a league id and at most one week")
+
+    # without a week the service follows the league as new weeks are scored
+    leagues = {league[0]: int(league[1]) if len(league) > 1 else None for league in args.league} if args.league else {
+        "649912836461539328": None}
+    service = LeagueService(leagues, model=MODELS[args.model])
+    service.start(args.refresh)
+
+    server = service.serve(port=args.port)
+    try:
+        server.serve_forever()
+    finally:
+        service.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from base_api import BaseApi
+
+
+class SleeperStub():
+    """local stand-in for the sleeper api that serves recorded json responses
+
+    responses live under a fixture directory mirroring the api paths, so
+    /v1/league/<id>/rosters is read from <fixtures>/v1/league/<id>/rosters.json
+    """
+
+    def __init__(self, fixtures: str, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.fixtures = fixtures
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """returns the base url to set as the api host"""
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def _handler(self):
+        """builds a request handler bound to this stubs' fixture directory"""
+        fixtures = self.fixtures
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = urlparse(self.path).path.strip("/")
+                fp = os.path.join(fixtures, *path.split("/")) + ".json"
+                if not os.path.isfile(fp):
+                    self.send_error(404)
+                    return
+
+                with open(fp, "rb") as file:
+                    body = file.read()
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> str:
+        """serves fixtures on a background thread and returns the stub url"""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        """shuts the stub server down"""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def record(league_id: str, fixtures: str) -> None:
+    """records the live api responses a league build needs into a fixture directory"""
+    api = BaseApi()
+    base = "v1/league/{}".format(league_id)
+    league = api._call("{}/{}".format(api.HOST, base))
+    paths = ["v1/players/nfl", base,
+             "{}/rosters".format(base), "{}/users".format(base)]
+    paths += ["{}/matchups/{}".format(base, week)
+              for week in range(1, league["settings"]["playoff_week_start"])]
+
+    for path in paths:
+        fp = os.path.join(fixtures, *path.split("/")) + ".json"
+        os.makedirs(os.path.dirname(fp), exist_ok=True)
+        with open(fp, "w") as file:
+            json.dump(league if path == base else api._call(
+                "{}/{}".format(api.HOST, path)), file)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="record the sleeper responses a league needs for offline use")
+    parser.add_argument("league_id", help="sleeper league id to record")
+    parser.add_argument("--fixtures", default="fixtures",
+                        help="directory to write the recorded responses to")
+    args = parser.parse_args()
+
+    record(args.league_id, args.fixtures)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import statistics as stats
+import numpy as np
 from dataclasses import dataclass
 from base_api import BaseApi
 from player import Player
@@ -241,6 +242,15 @@ class Team(BaseApi):
             loc=self.distribution[0], scale=self.distribution[1])
         self.simmed_weeks.append(predicted)
         return predicted
+
+    def predict_scores(self, model, runs: int, weeks: int) -> np.ndarray:
+        """predicts a (runs x weeks) block of scores from a fitted score model"""
+        return model.sample(self.roster_id, (runs, weeks))
+
+    def opponent(self, week: int) -> int:
+        """returns the roster id of this teams' opponent in a given week"""
+        matchup = self.matchups[week]
+        return matchup[0]["roster_id"] if matchup[0]["roster_id"] != self.roster_id else matchup[1]["roster_id"]
         
 def main() -> None:
     pass
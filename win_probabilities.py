@@ -0,0 +1,122 @@
+import math
+import numpy as np
+from league import League
+
+# abramowitz and stegun 7.1.26, accurate to 1.5e-7 everywhere
+_ERF_P = 0.3275911
+_ERF_A = (1.061405429, -1.453152027, 1.421413741, -0.284496736, 0.254829592)
+
+
+def _erf(x: np.ndarray) -> np.ndarray:
+    """error function over a whole array at once"""
+    z = np.abs(x)
+    t = 1 / (1 + _ERF_P * z)
+    poly = 0.0
+    for a in _ERF_A:
+        poly = poly * t + a
+    return np.sign(x) * (1 - poly * t * np.exp(-z ** 2))
+
+
+def normal_cdf(x: np.ndarray) -> np.ndarray:
+    """standard normal cumulative distribution function"""
+    return 0.5 * (1 + _erf(np.asarray(x, dtype=float) / math.sqrt(2)))
+
+
+class WinProbabilities():
+    """closed form win probabilities under the normal team score model
+
+    every team scores independently from a normal distribution fit to its
+    weekly points, so head to head odds come straight from the difference of
+    two normals and median game odds from integrating over a teams' score
+    """
+    NODES = 64
+
+    def __init__(self, league: League) -> None:
+        self.league = league
+        self.roster_ids = [team.roster_id for team in league.standings]
+        distributions = np.array([team.build_distribution(update=False)
+                                  for team in league.standings])
+        self.means = distributions[:, 0]
+        self.stdevs = distributions[:, 1]
+
+        self.build_matrix()
+        self.build_median_probabilities()
+
+    def build_matrix(self) -> None:
+        """builds the (teams x teams) probability that the row team outscores the column team"""
+        difference = self.means[:, None] - self.means[None, :]
+        spread = np.sqrt(self.stdevs[:, None] ** 2 + self.stdevs[None, :] ** 2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.matrix = normal_cdf(difference / spread)
+        np.fill_diagonal(self.matrix, 0.5)
+
+    def build_median_probabilities(self) -> None:
+        """builds each teams' probability of beating the weekly median, alone and
+        jointly with beating each opponent, since the two games share one score
+        """
+        teams = len(self.roster_ids)
+        nodes, weights = np.polynomial.hermite_e.hermegauss(self.NODES)
+        weights = weights / math.sqrt(2 * math.pi)
+
+        # below[i, j, k] is the chance team j scores under team i's kth quadrature score
+        scores = self.means[:, None] + self.stdevs[:, None] * nodes[None, :]
+        below = normal_cdf(
+            (scores[:, None, :] - self.means[None, :, None]) / self.stdevs[None, :, None])
+
+        # count how many of the other teams fall under team i, leaving out team o as well
+        # when i and o differ, as a poisson binomial built up one team at a time
+        counts = np.zeros((teams, teams, self.NODES, teams + 1))
+        counts[..., 0] = 1
+        index = np.arange(teams)
+        for j in range(teams):
+            p = below[:, None, j, :] * np.ones((1, teams, 1))
+            p[(index[:, None] == j) | (index[None, :] == j)] = 0
+            shifted = np.zeros_like(counts)
+            shifted[..., 1:] = counts[..., :-1]
+            counts = counts * (1 - p)[..., None] + shifted * p[..., None]
+
+        # a team beats the median when at least half of the other teams score under it
+        need = teams // 2
+        alone = counts[index, index, :, need:].sum(axis=-1)
+        with_opponent = counts[..., need - 1:].sum(axis=-1)
+
+        self.median = alone @ weights
+        self.joint = (below * with_opponent) @ weights
+        np.fill_diagonal(self.joint, 0)
+
+    def expected_wins(self) -> dict:
+        """returns each teams' expected remaining wins, their variance, projected
+        season wins and remaining strength of schedule from the schedule alone
+        """
+        opponents = self.league.remaining_opponents()
+        index = np.arange(len(self.roster_ids))[:, None]
+        head_to_head = self.matrix[index, opponents]
+        joint = self.joint[index, opponents]
+        median = self.median[:, None]
+
+        # weeks are independent, but a weeks' two games are not
+        expected = (head_to_head + median).sum(axis=1)
+        variance = (head_to_head * (1 - head_to_head) + median * (1 - median) +
+                    2 * (joint - head_to_head * median)).sum(axis=1)
+        schedule = (1 - head_to_head).mean(axis=1) if opponents.shape[1] else np.full(len(index), np.nan)
+
+        return {roster_id: {"expected": expected[i], "variance": variance[i],
+                            "projected": self.league.teams[roster_id].wins + expected[i],
+                            "schedule": schedule[i]}
+                for i, roster_id in enumerate(self.roster_ids)}
+
+
+def main() -> None:
+    from players import Players
+    from score_models import NormalModel
+
+    league = League(11, "649912836461539328", Players())
+    analytic = WinProbabilities(league).expected_wins()
+    simmed = league.sim_remaining_seasons(NormalModel(), 10000)
+    for roster_id in analytic:
+        print(league.teams[roster_id].name, analytic[roster_id]["expected"], simmed[roster_id][0].mean(),
+              analytic[roster_id]["variance"], simmed[roster_id][0].var())
+
+
+if __name__ == "__main__":
+    main()